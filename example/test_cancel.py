@@ -0,0 +1,79 @@
+import os,sys,inspect
+currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0,parentdir)
+sys.path.insert(0,os.path.join(parentdir,'src'))
+
+import simpm.des as des
+
+'''
+testing cancelling pending resource requests
+'''
+
+def run_cancel(R,waiting):
+    env=des.Environment()
+    res=R(env,'loader',init=1)
+    a,b,c,d=env.create_entities('truck',4)
+    got={}
+    def p(e):
+        yield e.get(res,1)
+        got[e.name+str(e.id)]=env.now
+        yield e.do('load',5)
+        yield e.put(res,1)
+    for e in (a,b,c,d):
+        env.process(p(e))
+    env.run(until=1)
+    assert [r.entity.name+str(r.entity.id) for r in res.request_list]==waiting
+    c.cancel(res)
+    assert c.not_pending(res)
+    assert len(res.request_list)==2
+    assert c not in [r.entity for r in res.request_list]
+    env.run()
+    assert got=={'truck1':0,'truck2':5,'truck4':10}
+    assert len(res.request_list)==0
+    return res
+
+def test_cancel_resource():
+    run_cancel(des.Resource,['truck2','truck3','truck4'])
+
+def test_cancel_priority_resource():
+    res=run_cancel(des.PriorityResource,['truck4','truck3','truck2'])
+    assert len(res._heap)==0
+
+def test_entity_cancel_priority_resource():
+    env=des.Environment()
+    res=des.PriorityResource(env,'loader',init=0)
+    e=des.Entity(env,'truck')
+    def p(priority):
+        yield e.get(res,1,priority)
+    env.process(p(1))
+    env.process(p(2))
+    env.run(until=1)
+    assert [r.priority for r in res.request_list]==[2,1]
+    # the matching request that comes first in the request list, the one to be granted last, is cancelled
+    e.cancel(res)
+    assert [r.priority for r in res.request_list]==[1]
+    assert e.is_pending(res)
+
+def test_cancel_priority_request_by_identity():
+    env=des.Environment()
+    res=des.PriorityResource(env,'loader',init=0)
+    e=des.Entity(env,'truck')
+    def p():
+        yield e.get(res,1,priority=2)
+    def q():
+        yield e.get(res,1,priority=1)
+    env.process(p())
+    env.process(q())
+    env.run(until=1)
+    low,high=res.request_list
+    assert (low.priority,high.priority)==(2,1)
+    res.cancel(high)
+    assert res.request_list==[low]
+
+if __name__=='__main__':
+    test_cancel_resource()
+    test_cancel_priority_resource()
+    test_entity_cancel_priority_resource()
+    test_cancel_priority_request_by_identity()
+    print('cancel: ok')
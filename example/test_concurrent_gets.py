@@ -0,0 +1,39 @@
+import os,sys,inspect
+currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0,parentdir)
+sys.path.insert(0,os.path.join(parentdir,'src'))
+
+import simpm.des as des
+
+'''
+testing an entity waiting for two resources at the same time
+'''
+
+def test_concurrent_gets():
+    env=des.Environment()
+    loader=des.Resource(env,'loader',init=0)
+    dumpsite=des.Resource(env,'dumpsite',init=0)
+    truck,feeder=env.create_entities('e',2)
+    got=[]
+    def get_loader():
+        yield truck.get(loader,1)
+        got.append(('loader',env.now))
+    def get_dumpsite():
+        yield truck.get(dumpsite,1)
+        got.append(('dumpsite',env.now))
+    def feed():
+        yield feeder.do('wait',1)
+        yield feeder.add(dumpsite,1)
+        yield feeder.do('wait',1)
+        yield feeder.add(loader,1)
+    for p in (get_loader,get_dumpsite,feed):
+        env.process(p())
+    env.run()
+    # the later request is granted first
+    assert got==[('dumpsite',1),('loader',2)]
+    assert truck.pending_requests==[]
+
+if __name__=='__main__':
+    test_concurrent_gets()
+    print('concurrent gets: ok')
@@ -0,0 +1,31 @@
+import os,sys,inspect
+currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0,parentdir)
+sys.path.insert(0,os.path.join(parentdir,'src'))
+
+import simpm.dist as dist
+
+'''
+testing the empirical distribution at the edges of the data
+'''
+
+def test_pdf_upper_edge():
+    d=dist.empirical([1,2,3,4,5,6,7,8])
+    # the last bin is closed, so the largest value falls into it
+    assert d.pdf(8)>0
+    assert d.pdf(8)==d.pdf(7)
+    assert d.pdf(1)==d.pdf(2)
+    assert d.pdf(8.5)==0 and d.pdf(0.5)==0
+
+def test_cdf_max_value():
+    d=dist.empirical([3,1,2,2,5])
+    assert d.cdf(5)==1
+    assert d.cdf(6)==1
+    assert d.cdf(2)==0.6
+    assert d.cdf(0)==0
+
+if __name__=='__main__':
+    test_pdf_upper_edge()
+    test_cdf_max_value()
+    print('empirical: ok')
@@ -0,0 +1,55 @@
+import os,sys,inspect
+currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0,parentdir)
+sys.path.insert(0,os.path.join(parentdir,'src'))
+
+import io
+import contextlib
+import numpy as np
+import simpm.des as des
+import simpm.dist as dist
+
+'''
+testing the errors raised for bad activity durations and resources
+'''
+
+def raises_type_error(f,*args):
+    out=io.StringIO()
+    with contextlib.redirect_stdout(out):
+        try:
+            f(*args)
+        except TypeError:
+            return out.getvalue()
+    raise AssertionError('TypeError was not raised')
+
+def test_bad_duration():
+    env=des.Environment()
+    e=des.Entity(env,'e')
+    assert raises_type_error(e.do,'dig','3')==''
+    assert raises_type_error(e.interruptive_do,'dig',[3])==''
+
+def test_accepted_durations():
+    env=des.Environment()
+    e=des.Entity(env,'e')
+    def p():
+        yield e.do('a',2)
+        yield e.do('b',np.float64(1.5))
+        yield e.do('c',np.array(0.5))
+        yield e.do('d',dist.uniform(1,2))
+    env.process(p())
+    env.run()
+    assert e.schedule()['finish_time'].tolist()[:3]==[2,3.5,4]
+    assert 5<=env.now<=6
+
+def test_get_non_resource():
+    env=des.Environment()
+    e=des.Entity(env,'e')
+    # nothing is printed, the error message says what went wrong
+    assert raises_type_error(e.get,'truck')==''
+
+if __name__=='__main__':
+    test_bad_duration()
+    test_accepted_durations()
+    test_get_non_resource()
+    print('entity errors: ok')
@@ -0,0 +1,50 @@
+import os,sys,inspect
+currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0,parentdir)
+sys.path.insert(0,os.path.join(parentdir,'src'))
+
+import simpm.des as des
+
+'''
+testing the order of grants and logs when a resource is put back
+'''
+
+def run_grant_order(R):
+    env=des.Environment()
+    res=R(env,'loader',init=1)
+    a,b,c=env.create_entities('truck',3)
+    got=[]
+    def pa():
+        yield a.get(res,1)
+        yield a.do('load',5)
+        yield a.put(res,1)
+    def pb():
+        yield b.get(res,1)
+        got.append((b.id,env.now))
+        yield b.do('load',5)
+        yield b.put(res,1)
+    def pc():
+        yield c.do('wait',5)
+        yield c.get(res,1)
+        got.append((c.id,env.now))
+    for p in (pa,pb,pc):
+        env.process(p())
+    env.run()
+    return got,res.status_log().values.tolist()
+
+def test_grant_order_resource():
+    got,status=run_grant_order(des.Resource)
+    assert got==[(2,5),(3,10)]
+    # at time 5 the request of truck3 joins the list before the put, and the put is logged before the grant
+    assert status==[[0,0,1,1],[0,0,1,2],[0,1,0,1],[5,1,0,2],[5,0,1,2],[5,1,0,1],[10,0,1,1],[10,1,0,0]]
+
+def test_grant_order_priority_resource():
+    got,status=run_grant_order(des.PriorityResource)
+    assert got==[(2,5),(3,10)]
+    assert status==[[0,0,1,1],[0,0,1,2],[0,1,0,1],[5,1,0,2],[5,0,1,2],[5,1,0,1],[10,0,1,1],[10,1,0,0]]
+
+if __name__=='__main__':
+    test_grant_order_resource()
+    test_grant_order_priority_resource()
+    print('grant order: ok')
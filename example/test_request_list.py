@@ -0,0 +1,30 @@
+import os,sys,inspect
+currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0,parentdir)
+sys.path.insert(0,os.path.join(parentdir,'src'))
+
+import simpm.des as des
+
+'''
+testing the request list of a priority resource
+'''
+
+def test_priority_request_list():
+    env=des.Environment()
+    R=des.PriorityResource(env,'crane',init=0)
+    def p(e,t,priority,amount):
+        yield e.do('wait',t)
+        yield e.get(R,amount,priority)
+    plan=[(0,2,1),(0,1,2),(0,1,1),(1,1,1),(0,2,1),(1,3,1)]
+    for t,priority,amount in plan:
+        env.process(p(des.Entity(env,'e'),t,priority,amount))
+    env.run(until=2)
+    requests=R.request_list
+    assert all(isinstance(r,des.PriorityRequest) for r in requests)
+    # the request to be granted next is the last one, equal requests are granted in the order they were made
+    assert [r.entity.id for r in requests]==[6,5,1,4,2,3]
+
+if __name__=='__main__':
+    test_priority_request_list()
+    print('request list: ok')
@@ -0,0 +1,32 @@
+import os,sys,inspect
+currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0,parentdir)
+sys.path.insert(0,os.path.join(parentdir,'src'))
+
+import simpm.des as des
+
+'''
+testing the status log of an entity
+'''
+
+def test_status_log():
+    env=des.Environment()
+    loader=des.Resource(env,'loader',init=1)
+    dumpsite=des.Resource(env,'dumpsite',init=0)
+    truck=des.Entity(env,'truck')
+    def p():
+        yield truck.get(loader,1)
+        yield truck.do('load',5)
+        yield truck.put(loader,1)
+        yield truck.add(dumpsite,2)
+    env.process(p())
+    env.run()
+    status=truck.status_log().values.tolist()
+    assert status==[[0,'wait for',loader.id],[0,'get',loader.id],
+                    [0,'start',1],[5,'finish',1],
+                    [5,'put',loader.id],[5,'add',dumpsite.id]]
+
+if __name__=='__main__':
+    test_status_log()
+    print('status log: ok')
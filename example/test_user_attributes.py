@@ -0,0 +1,31 @@
+import os,sys,inspect
+currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0,parentdir)
+sys.path.insert(0,os.path.join(parentdir,'src'))
+
+import simpm.des as des
+
+'''
+testing that users can attach their own fields to entities and resources
+'''
+
+def test_entity_and_resource_fields():
+    env=des.Environment()
+    truck=des.Entity(env,'truck')
+    loader=des.Resource(env,'loader')
+    truck.capacity=20
+    loader.speed=3
+    truck['load']=5
+    loader.attr['fuel']=100
+    assert truck.capacity==20
+    assert loader.speed==3
+    assert truck['load']==5
+    assert loader.attr['fuel']==100
+    for res in (des.PriorityResource(env,'crane'),des.PreemptiveResource(env,'repair')):
+        res.speed=2
+        assert res.speed==2
+
+if __name__=='__main__':
+    test_entity_and_resource_fields()
+    print('user attributes: ok')
@@ -4,18 +4,20 @@ Internal utility functions for the SimPM package.
 These functions are intended for internal use only and are not part of the public API.
 """
 
-from typing import Any
+from __future__ import annotations
 
-def _swap_dict_keys_values(original_dict: dict[Any,Any]) -> dict[Any,Any]:
-    """Swaps the keys and values of a dictionary. Usable for large dictionaries
+from numpy import array, ndarray
+
+def _log_array(rows: list[tuple] | None, ncols: int) -> ndarray:
+    """Converts the rows collected in a log buffer to a 2-D numpy array
 
     Args:
-        original_dict (dict): Original dictionary
+        rows (list or None): Log rows, each a tuple with ncols numbers. None stands for a log that was never written to
+        ncols (int): Number of columns of the log
 
     Returns:
-        dict: Swapped dictionary
+        numpy.ndarray: Array with one row per log entry and ncols columns
     """
-    swapped_dict = {}
-    for key, value in original_dict.items():
-        swapped_dict[value] = key
-    return swapped_dict
+    if rows is None:
+        rows = []
+    return array(rows).reshape(-1, ncols)
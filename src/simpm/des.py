@@ -3,14 +3,53 @@ Discrete Event Simulation for Project Management in Python.
 """
 from __future__ import annotations
 from typing import Any
+from numbers import Real
 
-from bisect import insort_left
-from pandas import DataFrame
-from numpy import array, append, nansum
+from collections import deque
+from heapq import heappush, heappop
+from itertools import count
+from pandas import DataFrame, Series
+from numpy import nansum, ndarray, issubdtype, number
 import simpy
 
 from simpm.dist import distribution
-from simpm._utils import _swap_dict_keys_values
+from simpm._utils import _log_array
+
+# status codes recorded in the entity status log
+_STATUS_WAIT_FOR = 1
+_STATUS_GET = 2
+_STATUS_START = 3
+_STATUS_FINISH = 4
+_STATUS_PUT = 5
+_STATUS_ADD = 6
+_STATUS_NAMES = {_STATUS_WAIT_FOR: "wait for", _STATUS_GET: "get", _STATUS_START: "start",
+                 _STATUS_FINISH: "finish", _STATUS_PUT: "put", _STATUS_ADD: "add"}
+
+
+def _activity_duration(name, dur):
+    """
+    Returns the duration of an activity as a number.
+
+    Parameters
+    ----------
+    name : string
+        Name of the activity, used in the error message
+    dur : float, int, 0-d numeric numpy array, or distribution
+        The duration of the activity, distributions are sampled
+
+    Raises
+    ------
+    TypeError
+        If dur is none of the accepted types
+    """
+    if isinstance(dur, distribution):
+        return dur.sample_positive()
+    if isinstance(dur, Real):
+        return dur
+    if isinstance(dur, ndarray) and dur.ndim == 0 and issubdtype(dur.dtype, number):
+        return dur.item()
+    raise TypeError(f"simpm: duration of activity {name} must be a real number, a 0-d numeric numpy array "
+                    f"or a distribution, not {type(dur).__name__}")
 
 class Entity:
     """
@@ -53,15 +92,16 @@ class Entity:
         env.entities.append(self)
         self.last_act_id: int = 0
         self.act_dic = {}
+        self._act_names = {}  # inverse of act_dic (act_id -> name), kept in step with it
         self.print_actions: bool = print_actions
         self.log: bool = log
         self.using_resources = {}  # a dictionary showing all the resources an entity is using
 
         # ***logs
-        self._schedule_log = array([[0, 0, 0]])  # act_id,act_start_time,act_finish_time
-        self._status_codes = {"wait for": 1, "get": 2, "start": 3, "finish": 4, "put": 5, "add": 6}
-        self._status_log = array([[0, 0, 0]])  # time,entity_status_code,actid/resid
-        self._waiting_log = array([[0, 0, 0, 0]])  # resource_id,start_waiting,end_waiting,amount waiting for
+        # rows are appended to plain lists and only turned into arrays when a log is requested
+        self._schedule_log: list[tuple] = []  # act_id,act_start_time,act_finish_time
+        self._status_log: list[tuple] = []  # time,entity_status_code,actid/resid
+        self._waiting_log: list[tuple] | None = None  # resource_id,start_waiting,end_waiting,amount waiting for; created on first wait
         self.pending_requests = []  # the simpy requests made by an entity but not granted yet
 
         if print_actions:
@@ -163,26 +203,30 @@ class Entity:
             The duration of that activity
         """
         if isinstance(duration, distribution):
-            d = -1
-            while d < 0:
-                d = duration.sample()
-            duration = d
+            duration = duration.sample_positive()
+        env = self.env
+        now = env.now
+        log = self.log
         if self.print_actions:
-            print(self.name + "(" + str(self.id) + ") started", name, ", sim_time:", self.env.now)
+            print(f"{self.name}({self.id}) started {name} , sim_time: {now}")
 
-        if name not in self.act_dic:
+        act_id = self.act_dic.get(name)
+        if act_id is None:
             self.last_act_id += 1
-            self.act_dic[name] = self.last_act_id
-        if self.log:
-            self._schedule_log = append(self._schedule_log, [[self.act_dic[name], self.env.now, self.env.now + duration]], axis=0)
-            self._status_log = append(self._status_log, [[self.env.now, self._status_codes["start"], self.act_dic[name]]], axis=0)
+            act_id = self.last_act_id
+            self.act_dic[name] = act_id
+            self._act_names[act_id] = name
+        if log:
+            self._schedule_log.append((act_id, now, now + duration))
+            self._status_log.append((now, _STATUS_START, act_id))
 
-        yield self.env.timeout(duration)
+        yield env.timeout(duration)
 
+        now = env.now
         if self.print_actions:
-            print(self.name + "(" + str(self.id) + ") finished", name, ", sim_time:", self.env.now)
-        if self.log:
-            self._status_log = append(self._status_log, [[self.env.now, self._status_codes["finish"], self.act_dic[name]]], axis=0)
+            print(f"{self.name}({self.id}) finished {name} , sim_time: {now}")
+        if log:
+            self._status_log.append((now, _STATUS_FINISH, act_id))
 
     def _interruptive_activity(self, name, duration):
         """
@@ -196,19 +240,22 @@ class Entity:
             The duration of that activity
         """
         if isinstance(duration, distribution):
-            d = -1
-            while d < 0:
-                d = duration.sample()
-            duration = d
+            duration = duration.sample_positive()
+        env = self.env
+        now = env.now
+        log = self.log
         if self.print_actions:
-            print(self.name + "(" + str(self.id) + ") started", name, ", sim_time:", self.env.now)
+            print(f"{self.name}({self.id}) started {name} , sim_time: {now}")
 
-        if name not in self.act_dic:
+        act_id = self.act_dic.get(name)
+        if act_id is None:
             self.last_act_id += 1
-            self.act_dic[name] = self.last_act_id
-        if self.log:
-            self._schedule_log = append(self._schedule_log, [[self.act_dic[name], self.env.now, self.env.now + duration]], axis=0)
-            self._status_log = append(self._status_log, [[self.env.now, self._status_codes["start"], self.act_dic[name]]], axis=0)
+            act_id = self.last_act_id
+            self.act_dic[name] = act_id
+            self._act_names[act_id] = name
+        if log:
+            self._schedule_log.append((act_id, now, now + duration))
+            self._status_log.append((now, _STATUS_START, act_id))
 
         # yield self.env.timeout(duration)
 
@@ -216,18 +263,19 @@ class Entity:
         while done_in:
             try:
                 # Working on the part
-                start = self.env.now
+                start = env.now
                 print("preemptive activity started at time", start)
-                yield self.env.timeout(done_in)
+                yield env.timeout(done_in)
                 done_in = 0
             except simpy.Interrupt:
-                print("preemptive activity interrupted at time:", self.env.now)
-                done_in -= self.env.now - start  # How much time left?
+                print("preemptive activity interrupted at time:", env.now)
+                done_in -= env.now - start  # How much time left?
                 print("some time is left:", done_in)
+        now = env.now
         if self.print_actions:
-            print(self.name + "(" + str(self.id) + ") finished", name, ", sim_time:", self.env.now)
-        if self.log:
-            self._status_log = append(self._status_log, [[self.env.now, self._status_codes["finish"], self.act_dic[name]]], axis=0)
+            print(f"{self.name}({self.id}) finished {name} , sim_time: {now}")
+        if log:
+            self._status_log.append((now, _STATUS_FINISH, act_id))
 
     @property
     def attributes(self) -> dict[str, Any]:
@@ -278,27 +326,10 @@ class Entity:
         Environment.process
             the process for the activity
         """
-        try:
-            if isinstance(dur, distribution):
-                d = -1
-                while d < 0:
-                    d = dur.sample()
-                dur = d
-
-            return self.env.process(self._activity(name, dur))
-        except:
-            print("simpm: error in  duration of activity", name)
+        return self.env.process(self._activity(name, _activity_duration(name, dur)))
 
     def interruptive_do(self, name, dur):
-        try:
-            if isinstance(dur, distribution):
-                d = -1
-                while d < 0:
-                    d = dur.sample()
-                dur = d
-        except:
-            print("simpm: error in  duration of activity", name)
-        return self.env.process(self._interruptive_activity(name, dur))
+        return self.env.process(self._interruptive_activity(name, _activity_duration(name, dur)))
 
     def get(self, res, amount=1, priority=1, preempt: bool = False):
         """
@@ -319,22 +350,19 @@ class Entity:
         simpm.environment.process
             The process for the request
         """
-        try:
-            if isinstance(amount, distribution):
-                a = -1
-                while a < 0:
-                    a = amount.sample()
-                amount = int(a)
-            if type(res) == Resource:
-                return self.env.process(res.get(self, amount))
-            elif type(res) == PriorityResource:
-                return self.env.process(res.get(self, amount, priority))
-            elif type(res) == PreemptiveResource:
-                if amount > 1:
-                    print("Warning: amount of preemptive resource is always 1")
-                return res.get(self, priority, preempt)
-        except:
-            print("simpm: error in get")
+        if isinstance(amount, distribution):
+            amount = int(amount.sample_positive())
+        # plain resources are by far the most common, so they are tested first
+        if isinstance(res, Resource):
+            return self.env.process(res.get(self, amount))
+        elif isinstance(res, PriorityResource):
+            return self.env.process(res.get(self, amount, priority))
+        elif isinstance(res, PreemptiveResource):
+            if amount > 1:
+                print("Warning: amount of preemptive resource is always 1")
+            return res.get(self, priority, preempt)
+        raise TypeError(f"simpm: {self.name}({self.id}) can only get a Resource, PriorityResource or "
+                        f"PreemptiveResource, not {type(res).__name__}")
 
     def add(self, res, amount=1):
         """
@@ -352,10 +380,7 @@ class Entity:
             The process for adding resources
         """
         if isinstance(amount, distribution):
-            a = -1
-            while a < 0:
-                a = amount.sample()  # ?can this amount be float!
-            amount = int(a)
+            amount = int(amount.sample_positive())  # ?can this amount be float!
         return self.env.process(res.add(self, amount))
 
     def put(self, res, amount=1, request=None):
@@ -374,11 +399,8 @@ class Entity:
             The process for putting back the resources
         """
         if isinstance(amount, distribution):
-            a = -1
-            while a < 0:
-                a = amount.sample()
-            amount = int(a)
-        if type(res) == PreemptiveResource:
+            amount = int(amount.sample_positive())
+        if isinstance(res, PreemptiveResource):
             if amount > 1:
                 amount = 1
                 print("Warning: amount of preemptive resource is always 1")
@@ -401,10 +423,7 @@ class Entity:
         True if entity is waiting for the resource, and False if the entity is not waiting for the resource
         """
 
-        for r in res.request_list:
-            if r.entity == self and r.amount == amount:
-                return True
-        return False
+        return res._pending_request(self, amount) is not None
 
     def not_pending(self, res, amount: int = 1):
         """
@@ -438,10 +457,10 @@ class Entity:
 
         """
 
-        for r in res.request_list:
-            if r.entity == self and r.amount == amount:
-                res.cancel(r)
-                return
+        r = res._pending_request(self, amount)
+        if r is not None:
+            res.cancel(r)
+            return
 
         self.put(res, amount)  # a problem may occur of someone adds to the resouce meanwhile we are canceling
 
@@ -454,8 +473,8 @@ class Entity:
             The schedule of each entity.
             The columns are activity name, and start time and finish time of that activity
         """
-        df = DataFrame(data=self._schedule_log[1:, :], columns=["activity", "start_time", "finish_time"])
-        df["activity"] = df["activity"].map(_swap_dict_keys_values(self.act_dic))
+        df = DataFrame(data=_log_array(self._schedule_log, 3), columns=["activity", "start_time", "finish_time"])
+        df["activity"] = df["activity"].map(self._act_names)
         return df
 
     def waiting_log(self):
@@ -468,8 +487,8 @@ class Entity:
             The columns show the resource name for which the entity is waiting for, time when waiting is started,
             time when waiting is finished, and the number of resources the entity is waiting for
         """
-        df = DataFrame(data=self._waiting_log[1:, :], columns=["resource", "start_waiting", "end_waiting", "resource_amount"])
-        df["resource"] = df["resource"].map(self.env.resource_names)
+        df = DataFrame(data=_log_array(self._waiting_log, 4), columns=["resource", "start_waiting", "end_waiting", "resource_amount"])
+        df["resource"] = df["resource"].map(self.env._resource_names_map())
         return df
 
     def waiting_time(self):
@@ -480,9 +499,8 @@ class Entity:
         numpy.array
             The waiting durations of the entity each time it waited for a resource
         """
-        a = self.waiting_log()
-        a = a["end_waiting"] - a["start_waiting"]
-        return a.values
+        log = _log_array(self._waiting_log, 4)
+        return log[:, 2] - log[:, 1]
 
     def status_log(self):
         """
@@ -494,8 +512,8 @@ class Entity:
             waiting for a resourcing, getting a resources, putting a resource back, or adding to a resouce,
             or it can be starting or finishing an activity
         """
-        df = DataFrame(data=self._status_log[1:, :], columns=["time", "status", "actid/resid"])
-        df["status"] = df["status"].map(_swap_dict_keys_values(self._status_codes))
+        df = DataFrame(data=_log_array(self._status_log, 3), columns=["time", "status", "actid/resid"])
+        df["status"] = df["status"].map(_STATUS_NAMES)
 
         return df
 
@@ -544,12 +562,14 @@ class GeneralResource:
         self.idle = init
         self.container = simpy.Container(env, capacity, init)
         self.queue_length = 0  # number of entities waiting for a resource
-        self.request_list = []
+        self._pending = {}  # (entity id, amount) -> pending requests in arrival order
+        self._cancelled = set()  # ids of cancelled requests still sitting in the internal queue
         self.attr = {}  # attributes for resoruces
 
-        # logs
-        self._status_log = array([[0, 0, 0, 0]])  # time,in-use,idle,queue-length
-        self._queue_log = array([[0, 0, 0, 0]])  # entityid,startTime,endTime,amount
+        # logs, kept as lists of rows like the entity logs
+        self._status_log: list[tuple] = []  # time,in-use,idle,queue-length
+        self._queue_log: list[tuple] | None = None  # entityid,startTime,endTime,amount; created on first granted request
+        self._stats_cache = None  # (number of status rows, result of _status_stats)
 
     def queue_log(self):
         """
@@ -560,8 +580,8 @@ class GeneralResource:
             All entities waiting for the resource, their start waiting time and
             finish waiting time are stored in this DataFrame
         """
-        df = DataFrame(data=self._queue_log[1:, :], columns=["entity", "start_time", "finish_time", "resource_amount"])
-        df["entity"] = df["entity"].map(self.env.entity_names)
+        df = DataFrame(data=_log_array(self._queue_log, 4), columns=["entity", "start_time", "finish_time", "resource_amount"])
+        df["entity"] = df["entity"].map(self.env._entity_names_map())
         return df
 
     def status_log(self):
@@ -574,7 +594,7 @@ class GeneralResource:
             in this DataFrame. The recorded statuses are number of in-use resources ,
             number of idle resources, and number of entities waiting for the resource.
         """
-        df = DataFrame(data=self._status_log[1:, :], columns=["time", "in_use", "idle", "queue_length"])
+        df = DataFrame(data=_log_array(self._status_log, 4), columns=["time", "in_use", "idle", "queue_length"])
         return df
 
     def waiting_time(self):
@@ -585,9 +605,8 @@ class GeneralResource:
         numpy.array
             The waiting durations for a resource
         """
-        a = self.queue_log()
-        a = a["finish_time"] - a["start_time"]
-        return a.values
+        log = _log_array(self._queue_log, 4)
+        return log[:, 2] - log[:, 1]
 
     ####*****************plotting is still under construction*************
     # def plot_utilization(self):
@@ -609,6 +628,28 @@ class GeneralResource:
     #     l.plot(x="time",y="queue_length")
     #     plt.show()
 
+    def _status_stats(self):
+        """
+        Computes the time-weighted statistics of the status log in a single pass.
+        The result is reused until a new row is added to the status log.
+
+        Returns
+        -------
+        tuple
+            total time in use, total idle time, time-weighted utilization,
+            and the time of the last status change
+        """
+        n = len(self._status_log)
+        if self._stats_cache is not None and self._stats_cache[0] == n:
+            return self._stats_cache[1]
+        log = _log_array(self._status_log, 4)
+        time, in_use, idle = log[:, 0], log[:, 1], log[:, 2]
+        d = time[1:] - time[:-1]
+        utilization = in_use / (in_use + idle)
+        stats = (nansum(d * in_use[:-1]), nansum(d * idle[:-1]), nansum(d * utilization[:-1]), time[-1])
+        self._stats_cache = (n, stats)
+        return stats
+
     def average_utilization(self):
         """
 
@@ -617,14 +658,8 @@ class GeneralResource:
         int
             The average utilization for the resource
         """
-        l = self.status_log()
-        t1 = l["time"].values[:-1]
-        t2 = l["time"].values[1:]
-        y = l["in_use"].values / (l["in_use"].values + l["idle"].values)
-        y_dur = y[:-1]
-        d = t2 - t1
-        r = nansum(d * y_dur) / l["time"].values[-1]
-        return r
+        _, _, utilization, end_time = self._status_stats()
+        return utilization / end_time
 
     def average_idleness(self):
         """
@@ -642,14 +677,7 @@ class GeneralResource:
         int
             The total idle time of the resource
         """
-        l = self.status_log()
-        t1 = l["time"].values[:-1]
-        t2 = l["time"].values[1:]
-        this_level = l["idle"].values
-        this_level = this_level[:-1]
-        d = t2 - t1
-        r = nansum(d * this_level)
-        return r
+        return self._status_stats()[1]
 
     def total_time_in_use(self):
         """
@@ -658,14 +686,7 @@ class GeneralResource:
         int
             The total idle time of the resource
         """
-        l = self.status_log()
-        t1 = l["time"].values[:-1]
-        t2 = l["time"].values[1:]
-        this_level = l["in_use"].values
-        this_level = this_level[:-1]
-        d = t2 - t1
-        r = nansum(d * this_level)
-        return r
+        return self._status_stats()[0]
 
     def average_level(self):
         """
@@ -674,8 +695,8 @@ class GeneralResource:
         int
             The average level for the resource
         """
-        l = self.status_log()
-        return self.total_time_idle() / l["time"].values[-1]
+        _, total_idle, _, end_time = self._status_stats()
+        return total_idle / end_time
 
     def _request(self, entity, amount):
         """
@@ -688,13 +709,14 @@ class GeneralResource:
         amount : int
             The number of requested resouces
         """
+        now = self.env.now
         self.queue_length += 1
         if self.print_actions or entity.print_actions:
-            print(entity.name + "(" + str(entity.id) + ")" + " requested", str(amount), self.name + "(s)" + "(" + str(self.id) + ")" + ", sim_time:", self.env.now)
+            print(f"{entity.name}({entity.id}) requested {amount} {self.name}(s)({self.id}), sim_time: {now}")
         if self.log:
-            self._status_log = append(self._status_log, [[self.env.now, self.in_use, self.idle, self.queue_length]], axis=0)
+            self._status_log.append((now, self.in_use, self.idle, self.queue_length))
         if entity.log:
-            entity._status_log = append(entity._status_log, [[self.env.now, entity._status_codes["wait for"], self.id]], axis=0)
+            entity._status_log.append((now, _STATUS_WAIT_FOR, self.id))
 
     def _get(self, entity, amount):
         """
@@ -707,18 +729,100 @@ class GeneralResource:
         amount : int
             The number of taken resouces
         """
+        now = self.env.now
         self.queue_length -= 1
         self.in_use += amount
         self.idle -= amount
         if self.print_actions or entity.print_actions:
-            print(entity.name + "(" + str(entity.id) + ")" + " got " + str(amount), self.name + "(s)" + "(" + str(self.id) + ")" + ", sim_time:", self.env.now)
+            print(f"{entity.name}({entity.id}) got {amount} {self.name}(s)({self.id}), sim_time: {now}")
         if self.log:
-            self._status_log = append(self._status_log, [[self.env.now, self.in_use, self.idle, self.queue_length]], axis=0)
+            self._status_log.append((now, self.in_use, self.idle, self.queue_length))
 
         if entity.log:
-            entity._status_log = append(entity._status_log, [[self.env.now, entity._status_codes["get"], self.id]], axis=0)
+            entity._status_log.append((now, _STATUS_GET, self.id))
         entity.using_resources[self] = amount
 
+    def _log_wait(self, request):
+        """
+        Record the waiting period of a request that has just been granted.
+
+        Parameters
+        ----------
+        request : Request or PriorityRequest
+            The granted request
+        """
+        entity = request.entity
+        now = self.env.now
+        if self.log:
+            if self._queue_log is None:
+                self._queue_log = []
+            self._queue_log.append((entity.id, request.time, now, request.amount))
+        if entity.log:
+            if entity._waiting_log is None:
+                entity._waiting_log = []
+            entity._waiting_log.append((self.id, request.time, now, request.amount))
+
+    def _index_request(self, request):
+        """
+        Add a request that has just joined the request list to the pending index.
+
+        Parameters
+        ----------
+        request : Request or PriorityRequest
+            The new pending request
+        """
+        key = (request.entity.id, request.amount)
+        pending = self._pending.get(key)
+        if pending is None:
+            self._pending[key] = [request]
+        else:
+            pending.append(request)
+
+    def _unindex_request(self, request):
+        """
+        Remove a request that is leaving the request list from the pending index.
+
+        Parameters
+        ----------
+        request : Request or PriorityRequest
+            The request that is granted or cancelled
+
+        Returns
+        -------
+        bool
+            False if the request was not pending
+        """
+        key = (request.entity.id, request.amount)
+        pending = self._pending.get(key)
+        if pending is None:
+            return False
+        for i, r in enumerate(pending):
+            if r is request:
+                del pending[i]
+                if not pending:
+                    del self._pending[key]
+                return True
+        return False
+
+    def _pending_request(self, entity, amount):
+        """
+        Find a pending request of an entity for the resource.
+
+        Parameters
+        ----------
+        entity : simpm.entity
+            The entity that made the request
+        amount : int
+            The number of requested resources
+
+        Returns
+        -------
+        Request, PriorityRequest or None
+            The oldest matching pending request, or None if the entity is not waiting for that amount
+        """
+        pending = self._pending.get((entity.id, amount))
+        return pending[0] if pending else None
+
     def _add(self, entity, amount):
         """
         Calculate needed logs when an entity add to the resource.
@@ -730,13 +834,14 @@ class GeneralResource:
         amount : int
             The number of added resouces
         """
+        now = self.env.now
         if self.print_actions or entity.print_actions:
-            print(entity.name + "(" + str(entity.id) + ")" + " added " + str(amount), self.name + "(s)" + "(" + str(self.id) + ")" + ", sim_time:", self.env.now)
+            print(f"{entity.name}({entity.id}) added {amount} {self.name}(s)({self.id}), sim_time: {now}")
         if self.log:
-            self._status_log = append(self._status_log, [[self.env.now, self.in_use, self.idle, self.queue_length]], axis=0)
+            self._status_log.append((now, self.in_use, self.idle, self.queue_length))
 
         if entity.log:
-            entity._status_log = append(entity._status_log, [[entity._status_codes["add"], self.id, self.env.now]], axis=0)
+            entity._status_log.append((now, _STATUS_ADD, self.id))
 
     def _put(self, entity, amount):
         """
@@ -749,24 +854,27 @@ class GeneralResource:
         amount : int
             The number of resouces being put back
         """
-        if self not in entity.using_resources:
+        using_resources = entity.using_resources
+        held = using_resources.get(self)
+        if held is None:
             raise Warning(entity.name, "did not got ", self.name, "to put it back")
-        if self in entity.using_resources and entity.using_resources[self] < amount:
+        if held < amount:
             raise Warning(entity.name, "did not got this many of", self.name, "to put it back")
 
-        entity.using_resources[self] = entity.using_resources[self] - amount
+        using_resources[self] = held - amount
 
         self.in_use -= amount
         self.idle += amount
 
+        now = self.env.now
         if self.print_actions or entity.print_actions:
-            print(entity.name + "(" + str(entity.id) + ")" + " put back " + str(amount), self.name + "(s)" + "(" + str(self.id) + ")" + ", sim_time:", self.env.now)
+            print(f"{entity.name}({entity.id}) put back {amount} {self.name}(s)({self.id}), sim_time: {now}")
 
         if self.log:
-            self._status_log = append(self._status_log, [[self.env.now, self.in_use, self.idle, self.queue_length]], axis=0)
+            self._status_log.append((now, self.in_use, self.idle, self.queue_length))
 
         if entity.log:
-            entity._status_log = append(entity._status_log, [[entity._status_codes["put"], self.id, self.env.now]], axis=0)
+            entity._status_log.append((now, _STATUS_PUT, self.id))
 
     def level(self):
         """
@@ -817,7 +925,7 @@ class GeneralResource:
         float
             The average  queue length for a resource
         """
-        return sum(self.waiting_time()) / (self.env.now)
+        return nansum(self.waiting_time()) / (self.env.now)
 
 
 class Request:
@@ -826,15 +934,14 @@ class Request:
     This class allows to keep all the requests in a sorted list of requests.
     """
 
+    __slots__ = ("time", "entity", "amount", "flag")
+
     def __init__(self, entity, amount):
         self.time = entity.env.now
         self.entity = entity
         self.amount = amount
         self.flag = simpy.Container(entity.env, init=0)  # show if the resource is obtained when flag truns 1
 
-    def __eq__(self, other_request):
-        return self.priority == other_request.priority and self.time == other_request.time and self.amount == other_request.amount
-
 
 class Resource(GeneralResource):
     def __init__(self, env, name, init=1, capacity=1000, print_actions=False, log=True):
@@ -859,9 +966,22 @@ class Resource(GeneralResource):
             defualt value is True.
         """
         super().__init__(env, name, capacity, init, print_actions, log)
+        # FIFO queue of requests, cancelled requests stay in it until they reach the head
+        self._queue = deque()
 
         # self.resource=simpy.PriorityResource(env,1) #shoule be deleted
 
+    @property
+    def request_list(self) -> list[Request]:
+        """
+        Returns
+        -------
+        list of Request
+            The pending requests for the resource in the order they will be granted
+        """
+        cancelled = self._cancelled
+        return [r for r in self._queue if id(r) not in cancelled]
+
     def get(self, entity, amount):
         """
         A method for getting the resource.
@@ -878,8 +998,9 @@ class Resource(GeneralResource):
         super()._request(entity, amount)
         pr = Request(entity, amount)
         entity.pending_requests.append(pr)  # append priority request to the eneity
-        self.request_list.append(pr)
-        yield self.env.timeout(0)  # ? why do we need this?
+        self._queue.append(pr)
+        self._index_request(pr)
+        yield self.env.timeout(0)  # lets every request made at this time join the list before the check
         yield entity.env.process(self._check_all_requests())
         yield pr.flag.get(1)  # flag shows that the resource is granted
 
@@ -887,23 +1008,34 @@ class Resource(GeneralResource):
         """
         Check to see if any rquest for the resource can be granted.
         """
-        while len(self.request_list) > 0 and self.request_list[0].amount <= self.container.level:
-            r = self.request_list.pop(0)  # remove the first element from the list
-            simpy_request = self.container.get(r.amount)
-            yield simpy_request
-            r.entity.pending_requests.remove(r)
+        queue = self._queue
+        cancelled = self._cancelled
+        container = self.container
+        while queue:
+            r = queue[0]
+            if cancelled and id(r) in cancelled:
+                # cancelled requests are only dropped once they reach the head of the queue
+                queue.popleft()
+                cancelled.discard(id(r))
+                continue
+            amount = r.amount
+            if amount > container.level:
+                break
+            queue.popleft()
+            self._unindex_request(r)
+            yield container.get(amount)
+            entity = r.entity
+            entity.pending_requests.remove(r)
             r.flag.put(1)
-            super()._get(r.entity, r.amount)
-            if self.log:
-                self._queue_log = append(self._queue_log, [[r.entity.id, r.time, self.env.now, r.amount]], axis=0)
-            if r.entity.log:
-                r.entity._waiting_log = append(r.entity._waiting_log, [[self.id, r.time, self.env.now, r.amount]], axis=0)
+            self._get(entity, amount)
+            self._log_wait(r)
 
     def cancel(self, priority_request):
-        if priority_request in self.request_list:
-            self.request_list.remove(priority_request)
-        else:
-            print("warning: the request can not be cancled as it is not in the request list")
+        if self._unindex_request(priority_request):
+            # marked here and dropped by _check_all_requests when it reaches the head of the queue
+            self._cancelled.add(id(priority_request))
+            return
+        print("warning: the request can not be cancled as it is not in the request list")
 
     def add(self, entity, amount):
         """
@@ -942,12 +1074,17 @@ class PriorityRequest:
     This class allows to keep all the requests in a sorted list of requests.
     """
 
+    __slots__ = ("time", "entity", "amount", "priority", "flag", "key", "seq")
+
     def __init__(self, entity, amount, priority):
         self.time = entity.env.now
         self.entity = entity
         self.amount = amount
         self.priority = priority
         self.flag = simpy.Container(entity.env, init=0)  # show if the resource is obtained
+        # the smaller the key, the higher the priority of the request
+        self.key = (priority, self.time, amount)
+        self.seq = None  # set by the resource, orders requests with equal keys by when they were made
 
     def __gt__(self, other_request):
         """
@@ -956,17 +1093,12 @@ class PriorityRequest:
         If the priority of two requests is equal and are made at the same time,
         the request with lower number of needed resources will have a higher priority.
         """
-        if self.priority == other_request.priority:
-            if self.time == other_request.time:
-                return self.amount < other_request.amount
-            else:
-                return self.time < other_request.time
-        return self.priority < other_request.priority
+        return self.key < other_request.key
 
     def __eq__(self, other_request):
         if type(other_request) != type(self):
             return False
-        return self.priority == other_request.priority and self.time == other_request.time and self.amount == other_request.amount
+        return self.key == other_request.key
 
     def __ge__(self, other_request):
         return self > other_request or self == other_request
@@ -995,9 +1127,46 @@ class PriorityResource(GeneralResource):
             defualt value is True.
         """
         super().__init__(env, name, capacity, init, print_actions, log)
-        self.request_list = []
+        # binary heap of (request key, seq, request), the request to be granted next is at index 0.
+        # seq keeps requests with equal keys in the order they were made
+        self._heap = []
+        self._seq = count()
         # self.resource=simpy.PriorityResource(env,1) #shoule be deleted
 
+    @property
+    def request_list(self) -> list[PriorityRequest]:
+        """
+        Returns
+        -------
+        list of PriorityRequest
+            The pending requests for the resource sorted by priority,
+            the request that will be granted next is the last one
+        """
+        cancelled = self._cancelled
+        return [item[-1] for item in sorted(self._heap, reverse=True) if id(item[-1]) not in cancelled]
+
+    def _pending_request(self, entity, amount):
+        """
+        Find a pending request of an entity for the resource.
+
+        Parameters
+        ----------
+        entity : simpm.entity
+            The entity that made the request
+        amount : int
+            The number of requested resources
+
+        Returns
+        -------
+        PriorityRequest or None
+            The matching pending request that comes first in request_list (the one to be granted last),
+            or None if the entity is not waiting for that amount
+        """
+        pending = self._pending.get((entity.id, amount))
+        if not pending:
+            return None
+        return max(pending, key=lambda r: (r.key, r.seq))
+
     def get(self, entity, amount, priority=1):
         """
         A method for getting the resource.
@@ -1013,9 +1182,11 @@ class PriorityResource(GeneralResource):
         """
         super()._request(entity, amount)
         pr = PriorityRequest(entity, amount, priority)
+        pr.seq = next(self._seq)
         entity.pending_requests.append(pr)  # append priority request to the eneity
-        insort_left(self.request_list, pr)
-        yield self.env.timeout(0)  # ? why do we need this?
+        heappush(self._heap, (pr.key, pr.seq, pr))
+        self._index_request(pr)
+        yield self.env.timeout(0)  # lets every request made at this time join the list before the check
         yield entity.env.process(self._check_all_requests())
         yield pr.flag.get(1)  # flag shows that the resource is granted
 
@@ -1023,27 +1194,40 @@ class PriorityResource(GeneralResource):
         """
         Check to see if any rquest for the resource can be granted.
         """
-        while len(self.request_list) > 0 and self.request_list[-1].amount <= self.container.level:
-            r = self.request_list.pop()
-            yield self.container.get(r.amount)
-            r.entity.pending_requests.remove(r)
+        heap = self._heap
+        cancelled = self._cancelled
+        container = self.container
+        while heap:
+            r = heap[0][-1]
+            if cancelled and id(r) in cancelled:
+                # cancelled requests are only dropped once they reach the top of the heap
+                heappop(heap)
+                cancelled.discard(id(r))
+                continue
+            amount = r.amount
+            if amount > container.level:
+                break
+            heappop(heap)
+            self._unindex_request(r)
+            yield container.get(amount)
+            entity = r.entity
+            entity.pending_requests.remove(r)
             r.flag.put(1)
-            super()._get(r.entity, r.amount)
-            if self.log:
-                self._queue_log = append(self._queue_log, [[r.entity.id, r.time, self.env.now, r.amount]], axis=0)
-            if r.entity.log:
-                r.entity._waiting_log = append(r.entity._waiting_log, [[self.id, r.time, self.env.now, r.amount]], axis=0)
+            self._get(entity, amount)
+            self._log_wait(r)
 
     def cancel(self, priority_request):
-        # ***the followig code did not work***
-        # if priority_request in self.request_list:
-        # self.request_list.remove(priority_request)
-        # remove does not work since it uses equal defined in the priority resource class
-        for i in range(len(self.request_list)):
-            pr = self.request_list[i]
-            if pr.entity == priority_request.entity and pr.amount == priority_request.amount:
-                del self.request_list[i]
-                return
+        # requests are marked here and dropped by _check_all_requests when they reach the top of the heap
+        if self._unindex_request(priority_request):
+            self._cancelled.add(id(priority_request))
+            return
+        # otherwise it is matched by entity and amount, and the match that comes first in request_list
+        # (the one to be granted last) is cancelled
+        pr = self._pending_request(priority_request.entity, priority_request.amount)
+        if pr is not None:
+            self._unindex_request(pr)
+            self._cancelled.add(id(pr))
+            return
 
         print("warning: the priority request can not be cancled as it is not in the request list")
 
@@ -1105,6 +1289,7 @@ class PreemptiveResource(GeneralResource):
             defualt value is True.
         """
         super().__init__(env, name, 1, 1, print_actions, log)
+        self.request_list = []
 
         self.resource = simpy.PreemptiveResource(env, 1)
         self.request = None  # the request of the entity that is currently using the resource
@@ -1161,6 +1346,32 @@ class Environment(simpy.Environment):
         self.resource_names = {}
         self.run_number = 0
         self.finishedTime = []
+        # Series versions of entity_names/resource_names used to map ids in the logs,
+        # rebuilt only when a new entity or resource has been registered
+        self._entity_name_series = Series(dtype=object)
+        self._resource_name_series = Series(dtype=object)
+
+    def _entity_names_map(self):
+        """
+        Returns
+        -------
+        pandas.Series
+            The entity names indexed by entity id
+        """
+        if len(self._entity_name_series) != len(self.entity_names):
+            self._entity_name_series = Series(self.entity_names, dtype=object)
+        return self._entity_name_series
+
+    def _resource_names_map(self):
+        """
+        Returns
+        -------
+        pandas.Series
+            The resource names indexed by resource id
+        """
+        if len(self._resource_name_series) != len(self.resource_names):
+            self._resource_name_series = Series(self.resource_names, dtype=object)
+        return self._resource_name_series
 
     def create_entities(self, name, total_number, print_actions=False, log=True):
         """
@@ -1181,7 +1392,4 @@ class Environment(simpy.Environment):
         list of entitiy
             A list containing all the created entities
         """
-        Entities = []
-        for i in range(total_number):
-            Entities.append(Entity(self, name, print_actions, log))
-        return Entities
+        return [Entity(self, name, print_actions, log) for _ in range(total_number)]
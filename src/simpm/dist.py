@@ -7,7 +7,6 @@ statistical measures for decision-making and risk assessment.
 '''
 import numpy as np
 import scipy.stats as st
-import matplotlib.pyplot as plt
 
 def fit(data,dist_type,method='mle'):
     '''
@@ -124,6 +123,24 @@ class distribution():
         '''
         return self.dist.rvs()
 
+    def sample_positive(self):
+        '''
+        Generates a non-negative random sample from the distribution. Negative samples are rejected and redrawn.
+
+        Parameters:
+        -----------
+        None
+
+        Returns:
+        --------
+        float
+            A non-negative random sample of the distribution.
+        '''
+        x=self.sample()
+        while x<0:
+            x=self.sample()
+        return x
+
     def samples(self,n):
         '''
         Generates multiple random samples from the distribution.
@@ -175,6 +192,7 @@ class distribution():
         matplotlib.pyplot.figure
             A plot showing the probability density function.
         '''
+        import matplotlib.pyplot as plt
         x,y=self.pdf_xy()
         plt.plot(x,y,'r')
         plt.xlabel("x")
@@ -217,6 +235,7 @@ class distribution():
         matplotlib.pyplot.figure
             A plot showing the cumulative distribution function.
         '''
+        import matplotlib.pyplot as plt
         x,y=self.cdf_xy(100)
         plt.plot(x,y,'b')
         plt.xlabel("x")
@@ -539,6 +558,16 @@ class empirical(distribution):
         self.params = None
         self.dist = None
         self.data = np.sort(data)
+        self._hist = None
+
+    def _histogram(self):
+        '''
+        Returns the histogram (counts, bin edges) of the data. It is computed once and reused by pdf and pdf_xy.
+        '''
+        if self._hist is None:
+            bins = int(2 * len(self.data) ** (1/3))
+            self._hist = np.histogram(self.data, bins)
+        return self._hist
     
     def cdf_xy(self):
         '''
@@ -553,6 +582,7 @@ class empirical(distribution):
         '''
         Plots the cumulative distribution function (CDF) of the empirical distribution.
         '''
+        import matplotlib.pyplot as plt
         x, y = self.cdf_xy()
         plt.step(x, y)
         plt.show()
@@ -561,8 +591,7 @@ class empirical(distribution):
         '''
         Returns x, y numpy arrays for plotting the probability density function (PDF).
         '''
-        bins = int(2 * len(self.data) ** (1/3))
-        value, BinList = np.histogram(self.data, bins)
+        value, BinList = self._histogram()
         value = value / len(self.data)
         l = BinList[-1] - BinList[0]
         n = len(BinList)
@@ -575,6 +604,7 @@ class empirical(distribution):
         '''
         Plots the probability density function (PDF) of the empirical distribution.
         '''
+        import matplotlib.pyplot as plt
         x, y = self.pdf_xy()
         plt.bar(x, y, width=np.diff(x)[0])
         plt.show()
@@ -593,14 +623,11 @@ class empirical(distribution):
         float
             The PDF value at the given point.
         '''
-        bins = int(2 * len(self.data) ** (1/3))
-        value, BinList = np.histogram(self.data, bins)
+        value, BinList = self._histogram()
         if x < BinList[0] or x > BinList[-1]:
             return 0
-        i = 0
-        bl = len(BinList)
-        while x >= BinList[i] and i < bl:
-            i += 1
+        # the last bin is closed, so x == BinList[-1] falls into it
+        i = min(np.searchsorted(BinList, x, side='right'), len(value))
         r = value[i-1] / len(self.data)
         l = BinList[-1] - BinList[0]
         n = len(BinList)
@@ -622,12 +649,8 @@ class empirical(distribution):
         float
             The CDF value at the given point.
         '''
-        if x > self.data[-1]:
-            return 1
-        i = 0
-        while x >= self.data[i]:
-            i += 1
-        return i / len(self.data)
+        # data is sorted in __init__, so the count of values <= x is a binary search
+        return np.searchsorted(self.data, x, side='right') / len(self.data)
  
     def percentile(self, q):
         '''